@@ -1,9 +1,11 @@
 from flask import Flask, request, jsonify
 from flask_cors import CORS
-from utils.resume_parser import parse_resume
+from utils.resume_parser import parse_resume, parse_resume_sections
 from utils.gemini_analyzer import analyze_resume
 from utils.linkedin_scraper import search_jobs
+from utils.job_matcher import get_job_corpus
 import os
+import hmac
 from dotenv import load_dotenv
 import logging
 import time
@@ -32,6 +34,13 @@ CORS(app, resources={
 GEMINI_TIMEOUT = 90  # seconds
 LINKEDIN_TIMEOUT = 30  # seconds
 
+# Limits for adding job descriptions through /jobs
+MAX_JOBS_PER_REQUEST = 500
+MAX_JOBS_PAYLOAD = 5 * 1024 * 1024  # 5MB in bytes
+
+# Index the local job description corpus once at startup
+job_corpus = get_job_corpus()
+
 @app.route('/analyze', methods=['POST'])
 def analyze():
     start_time = time.time()
@@ -140,6 +149,110 @@ def analyze():
             "processing_time": time.time() - start_time
         }), 500
 
+@app.route('/match', methods=['POST'])
+def match():
+    start_time = time.time()
+    try:
+        logger.info("Received match request")
+
+        if 'file' not in request.files:
+            logger.error("No file in request")
+            return jsonify({"error": "No file provided"}), 400
+
+        file = request.files['file']
+        if file.filename == '':
+            logger.error("Empty filename")
+            return jsonify({"error": "No file selected"}), 400
+
+        if not file.filename.lower().endswith(('.pdf', '.docx')):
+            logger.error("Invalid file format")
+            return jsonify({"error": "Invalid file format. Please upload a PDF or DOCX file"}), 400
+
+        # Check file size (5MB limit)
+        file_content = file.read()
+        file.seek(0)  # Reset file pointer after reading
+        if len(file_content) > 5 * 1024 * 1024:  # 5MB in bytes
+            logger.error("File too large")
+            return jsonify({"error": "File size too large. Please upload a file smaller than 5MB"}), 400
+
+        try:
+            limit = min(max(int(request.form.get('limit', 10)), 1), 50)
+        except ValueError:
+            return jsonify({"error": "Invalid limit"}), 400
+
+        # Parse resume
+        try:
+            sections = parse_resume_sections(file)
+            if not any(text.strip() for text in sections.values()):
+                logger.error("Could not extract text from resume")
+                return jsonify({"error": "Could not extract text from the resume"}), 400
+            logger.info("Resume parsed successfully")
+        except Exception as e:
+            logger.error(f"Error parsing resume: {str(e)}")
+            return jsonify({"error": f"Error parsing resume: {str(e)}"}), 500
+
+        match_start = time.time()
+        matches = job_corpus.search(sections, limit=limit)
+        logger.info(f"Scored resume against {len(job_corpus)} job descriptions in {(time.time() - match_start) * 1000:.1f} ms")
+
+        return jsonify({
+            "matches": matches,
+            "total_jobs": len(job_corpus),
+            "processing_time": time.time() - start_time
+        })
+
+    except Exception as e:
+        logger.error(f"Unexpected error in match: {str(e)}")
+        return jsonify({
+            "error": "An error occurred while processing your request",
+            "details": str(e),
+            "processing_time": time.time() - start_time
+        }), 500
+
+@app.route('/jobs', methods=['POST'])
+def add_jobs():
+    try:
+        # Writes replace jobs by id, so only callers holding the admin key may add them
+        api_key = os.getenv('JOBS_API_KEY')
+        if not api_key:
+            logger.error("Adding job descriptions is disabled, JOBS_API_KEY is not set")
+            return jsonify({"error": "Adding job descriptions is disabled"}), 403
+
+        auth_header = request.headers.get('Authorization', '')
+        token = auth_header[len('Bearer '):] if auth_header.startswith('Bearer ') else ''
+        if not hmac.compare_digest(token.encode(), api_key.encode()):
+            logger.error("Unauthorized request to add job descriptions")
+            return jsonify({"error": "Unauthorized"}), 401
+
+        if request.content_length is None or request.content_length > MAX_JOBS_PAYLOAD:
+            logger.error("Job descriptions payload missing a length or too large")
+            return jsonify({"error": "Payload too large. Please send less than 5MB of job descriptions"}), 413
+
+        data = request.get_json(silent=True)
+        if isinstance(data, dict):
+            data = [data]
+        if not isinstance(data, list) or not data:
+            logger.error("No job descriptions in request")
+            return jsonify({"error": "Provide a job description object or a list of them"}), 400
+
+        if len(data) > MAX_JOBS_PER_REQUEST:
+            logger.error(f"Too many job descriptions in request: {len(data)}")
+            return jsonify({"error": f"Too many job descriptions. Please send at most {MAX_JOBS_PER_REQUEST} per request"}), 400
+
+        try:
+            added = job_corpus.add_jobs(data)
+        except ValueError as e:
+            logger.error(f"Cannot add job descriptions: {str(e)}")
+            return jsonify({"error": str(e)}), 409
+        if not added:
+            return jsonify({"error": "No valid job descriptions provided"}), 400
+
+        return jsonify({"added": added, "total_jobs": len(job_corpus)})
+
+    except Exception as e:
+        logger.error(f"Unexpected error in add_jobs: {str(e)}")
+        return jsonify({"error": "An error occurred while adding job descriptions", "details": str(e)}), 500
+
 # Error handling
 @app.errorhandler(500)
 def handle_500_error(e):
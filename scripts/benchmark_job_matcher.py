@@ -0,0 +1,107 @@
+"""
+Benchmark /match scoring on a synthetic job description corpus
+
+    python scripts/benchmark_job_matcher.py --jobs 100000
+
+Job descriptions and resumes are drawn from a Zipf-distributed vocabulary
+plus a skill list, with a fixed seed so runs are comparable.
+"""
+import argparse
+import itertools
+import logging
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.job_matcher import JobIndex  # noqa: E402
+
+SKILLS = [
+    'Python', 'Java', 'JavaScript', 'TypeScript', 'SQL', 'PostgreSQL', 'MySQL', 'MongoDB', 'Redis',
+    'Docker', 'Kubernetes', 'AWS', 'Azure', 'GCP', 'Terraform', 'Linux', 'Git', 'React', 'Angular',
+    'Vue', 'Node.js', 'Django', 'Flask', 'FastAPI', 'Spring', 'Go', 'Rust', 'Scala', 'Kotlin', 'Swift',
+    'Spark', 'Kafka', 'Airflow', 'Hadoop', 'Tableau', 'Excel', 'Machine Learning', 'Deep Learning',
+    'TensorFlow', 'PyTorch', 'Pandas', 'NumPy', 'REST APIs', 'GraphQL', 'CI/CD', 'Jenkins', 'Agile',
+    'Scrum', 'Data Analysis', 'Statistics', 'Project Management', 'Communication', 'Leadership'
+]
+TITLES = ['Software Engineer', 'Data Scientist', 'Backend Developer', 'Frontend Developer',
+          'DevOps Engineer', 'Data Engineer', 'Machine Learning Engineer', 'Full Stack Developer']
+
+
+class Corpus:
+    def __init__(self, vocabulary_size, seed):
+        self.random = random.Random(seed)
+        self.vocabulary = [f"word{i}" for i in range(vocabulary_size)]
+        self.cum_weights = list(itertools.accumulate(1 / (i + 1) for i in range(vocabulary_size)))
+        self.skill_weights = list(itertools.accumulate(1 / (i + 1) ** 0.5 for i in range(len(SKILLS))))
+
+    def words(self, count):
+        return self.random.choices(self.vocabulary, cum_weights=self.cum_weights, k=count)
+
+    def skills(self, count):
+        return list(dict.fromkeys(self.random.choices(SKILLS, cum_weights=self.skill_weights, k=count)))
+
+    def job(self, job_id):
+        skills = self.skills(6)
+        description = ' '.join(self.words(self.random.randint(150, 400)) + skills)
+        return {'id': job_id, 'title': self.random.choice(TITLES), 'description': description, 'skills': skills}
+
+    def resume(self):
+        return {
+            'experience': ' '.join(self.words(500) + self.skills(8)),
+            'education': ' '.join(self.words(40)),
+            'skills': ', '.join(self.skills(12)),
+            'other': ' '.join(self.words(30))
+        }
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(int(len(values) * fraction), len(values) - 1)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--jobs', type=int, default=100000, help='number of job descriptions to index')
+    parser.add_argument('--queries', type=int, default=50, help='number of resumes to score')
+    parser.add_argument('--updates', type=int, default=20, help='number of add-then-search rounds')
+    parser.add_argument('--vocabulary', type=int, default=50000, help='synthetic vocabulary size')
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    corpus = Corpus(args.vocabulary, args.seed)
+    index = JobIndex()
+
+    jobs = [corpus.job(job_id) for job_id in range(args.jobs)]
+    start = time.perf_counter()
+    index.add_jobs(jobs)
+    print(f"indexed {len(index)} jobs in {time.perf_counter() - start:.1f} s")
+
+    resumes = [corpus.resume() for _ in range(args.queries)]
+    index.search(resumes[0])  # warm up
+
+    timings = []
+    for resume in resumes:
+        start = time.perf_counter()
+        index.search(resume)
+        timings.append((time.perf_counter() - start) * 1000)
+    print(f"search: p50 {statistics.median(timings):.1f} ms, p95 {percentile(timings, 0.95):.1f} ms, "
+          f"max {max(timings):.1f} ms over {len(timings)} resumes")
+
+    timings = []
+    for round_number in range(args.updates):
+        job = corpus.job(f"new-{round_number}")
+        start = time.perf_counter()
+        index.add_job(job)
+        index.search(resumes[round_number % len(resumes)])
+        timings.append((time.perf_counter() - start) * 1000)
+    print(f"add + search: p50 {statistics.median(timings):.1f} ms, p95 {percentile(timings, 0.95):.1f} ms, "
+          f"max {max(timings):.1f} ms over {len(timings)} rounds")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,178 @@
+import io
+import os
+
+import pytest
+
+# utils.gemini_analyzer refuses to import without a key, no request is made with it
+os.environ.setdefault('GEMINI_API_KEY', 'test-key')
+
+import app as app_module  # noqa: E402
+from utils.job_matcher import JobCorpus  # noqa: E402
+
+API_KEY = 'secret-admin-key'
+
+
+def make_sections(skills='', experience='', education='', other=''):
+    return {
+        'experience': experience,
+        'education': education,
+        'skills': skills,
+        'other': other
+    }
+
+
+@pytest.fixture
+def corpus(tmp_path, monkeypatch):
+    corpus = JobCorpus(str(tmp_path / 'jobs.jsonl'))
+    monkeypatch.setattr(app_module, 'job_corpus', corpus)
+    return corpus
+
+
+@pytest.fixture
+def client():
+    app_module.app.config['TESTING'] = True
+    return app_module.app.test_client()
+
+
+@pytest.fixture
+def resume(monkeypatch):
+    """Stub the parser so /match scores the given sections"""
+    def use(sections):
+        monkeypatch.setattr(app_module, 'parse_resume_sections', lambda file: sections)
+    use(make_sections(skills='Python, Django'))
+    return use
+
+
+def post_resume(client, filename='resume.pdf', **form):
+    data = {'file': (io.BytesIO(b'resume'), filename)}
+    data.update(form)
+    return client.post('/match', data=data, content_type='multipart/form-data')
+
+
+def post_jobs(client, payload, token=API_KEY):
+    headers = {'Authorization': f"Bearer {token}"} if token is not None else {}
+    return client.post('/jobs', json=payload, headers=headers)
+
+
+@pytest.fixture
+def admin_key(monkeypatch):
+    monkeypatch.setenv('JOBS_API_KEY', API_KEY)
+
+
+def test_match_ranks_jobs(client, corpus, resume):
+    corpus.index.add_jobs([
+        {'id': 'py', 'title': 'Python Developer', 'description': 'Django services', 'skills': ['Python', 'AWS']},
+        {'id': 'java', 'title': 'Java Developer', 'description': 'Spring services'},
+    ])
+
+    response = post_resume(client)
+
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['total_jobs'] == 2
+    assert [match['id'] for match in body['matches']] == ['py']
+    assert body['matches'][0]['matched_skills'] == ['python', 'django']
+    assert body['matches'][0]['missing_skills'] == ['AWS']
+
+
+def test_match_requires_a_supported_file(client, corpus, resume):
+    assert client.post('/match', data={}, content_type='multipart/form-data').status_code == 400
+    assert post_resume(client, filename='').status_code == 400
+    assert post_resume(client, filename='resume.txt').status_code == 400
+
+
+def test_match_rejects_an_empty_resume(client, corpus, resume):
+    resume(make_sections(skills='  ', other='\n'))
+
+    response = post_resume(client)
+    assert response.status_code == 400
+    assert response.get_json()['error'] == "Could not extract text from the resume"
+
+
+@pytest.mark.parametrize('limit', ['abc', '', '2.5'])
+def test_match_rejects_an_invalid_limit(client, corpus, resume, limit):
+    response = post_resume(client, limit=limit)
+    assert response.status_code == 400
+    assert response.get_json()['error'] == "Invalid limit"
+
+
+@pytest.mark.parametrize('limit, expected', [('0', 1), ('-5', 1), ('3', 3), ('500', 50)])
+def test_match_clamps_the_limit(client, corpus, resume, limit, expected):
+    corpus.index.add_jobs([{'id': i, 'title': 'Python Developer'} for i in range(60)])
+
+    response = post_resume(client, limit=limit)
+    assert response.status_code == 200
+    assert len(response.get_json()['matches']) == expected
+
+
+def test_jobs_disabled_without_an_admin_key(client, corpus, monkeypatch):
+    monkeypatch.delenv('JOBS_API_KEY', raising=False)
+
+    response = post_jobs(client, {'title': 'Python Developer'})
+    assert response.status_code == 403
+    assert len(corpus) == 0
+
+
+@pytest.mark.parametrize('token', [None, '', 'wrong-key', API_KEY + 'x'])
+def test_jobs_rejects_a_bad_token(client, corpus, admin_key, token):
+    response = post_jobs(client, {'title': 'Python Developer'}, token=token)
+    assert response.status_code == 401
+    assert len(corpus) == 0
+
+
+def test_jobs_rejects_a_large_payload(client, corpus, admin_key, monkeypatch):
+    monkeypatch.setattr(app_module, 'MAX_JOBS_PAYLOAD', 100)
+
+    response = post_jobs(client, {'title': 'Python Developer', 'description': 'x' * 200})
+    assert response.status_code == 413
+    assert len(corpus) == 0
+
+
+def test_jobs_caps_the_batch_size(client, corpus, admin_key, monkeypatch):
+    monkeypatch.setattr(app_module, 'MAX_JOBS_PER_REQUEST', 2)
+
+    response = post_jobs(client, [{'title': f"Developer {i}"} for i in range(3)])
+    assert response.status_code == 400
+    assert len(corpus) == 0
+
+    assert post_jobs(client, [{'title': f"Developer {i}"} for i in range(2)]).status_code == 200
+
+
+@pytest.mark.parametrize('payload', [[], 'not a job', [{'title': ''}, 42]])
+def test_jobs_rejects_invalid_job_descriptions(client, corpus, admin_key, payload):
+    assert post_jobs(client, payload).status_code == 400
+    assert len(corpus) == 0
+
+
+def test_jobs_refuses_to_append_to_a_json_array_corpus(client, tmp_path, admin_key, monkeypatch):
+    path = tmp_path / 'jobs.json'
+    path.write_text('[\n  {"id": "a", "title": "Java Developer"}\n]\n')
+    monkeypatch.setattr(app_module, 'job_corpus', JobCorpus(str(path)))
+
+    response = post_jobs(client, {'title': 'Python Developer'})
+    assert response.status_code == 409
+    assert path.read_text() == '[\n  {"id": "a", "title": "Java Developer"}\n]\n'
+
+
+def test_added_jobs_are_persisted_and_matched(client, corpus, admin_key, resume):
+    response = post_jobs(client, [{'id': 'py', 'title': 'Python Developer'}, {'title': 'Java Developer'}])
+
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['added'][0] == 'py'
+    assert body['total_jobs'] == 2
+    assert len(JobCorpus(corpus.path).search(make_sections(skills='Java'))) == 1
+
+    matches = post_resume(client).get_json()['matches']
+    assert [match['id'] for match in matches] == ['py']
+
+
+def test_jobs_requires_a_content_length(client, corpus, admin_key):
+    response = client.post(
+        '/jobs',
+        input_stream=io.BytesIO(b'{"title": "Python Developer"}'),
+        headers={'Authorization': f"Bearer {API_KEY}", 'Content-Type': 'application/json',
+                 'Transfer-Encoding': 'chunked'}
+    )
+    assert response.status_code == 413
+    assert len(corpus) == 0
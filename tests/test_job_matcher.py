@@ -0,0 +1,387 @@
+import random
+
+import pytest
+
+from utils.job_matcher import (
+    BM25_B,
+    BM25_K1,
+    MAX_QUERY_TERMS,
+    JobCorpus,
+    JobIndex,
+    extract_skills,
+    match_skill,
+    parse_jobs,
+    tokenize,
+)
+from utils.resume_parser import clean_text
+
+
+def make_sections(skills='', experience='', education='', other=''):
+    return {
+        'experience': experience,
+        'education': education,
+        'skills': skills,
+        'other': other
+    }
+
+
+def test_skills_string_is_split_into_skills():
+    index = JobIndex()
+    index.add_job({'id': 'a', 'title': 'Backend Engineer', 'skills': 'Python, SQL'})
+
+    result = index.search(make_sections(skills='Python'))
+    assert result[0]['missing_skills'] == ['SQL']
+
+
+def test_generated_ids_do_not_replace_existing_jobs():
+    index = JobIndex()
+    index.add_job({'id': '1', 'title': 'Python Developer'})
+    generated_id = index.add_job({'title': 'Java Developer'})
+
+    assert len(index) == 2
+    assert generated_id != '1'
+
+
+def test_zero_is_a_valid_id():
+    index = JobIndex()
+    assert index.add_job({'id': 0, 'title': 'Python Developer'}) == '0'
+    index.add_job({'id': 0, 'title': 'Java Developer'})
+
+    assert len(index) == 1
+    assert index.search(make_sections(skills='Java'))[0]['title'] == 'Java Developer'
+
+
+def test_parse_jobs_skips_malformed_lines():
+    content = '{"id": "a", "title": "Python Developer"}\n{not json\n{"id": "b", "title": "Java Developer"}\n'
+    assert [job['id'] for job in parse_jobs(content)] == ['a', 'b']
+
+
+def test_parse_jobs_accepts_array_and_single_object():
+    assert parse_jobs('[{"id": "a"}, {"id": "b"}]') == [{'id': 'a'}, {'id': 'b'}]
+    assert parse_jobs('{"id": "a", "title": "Python Developer"}') == [{'id': 'a', 'title': 'Python Developer'}]
+    assert parse_jobs('  ') == []
+
+
+def build_noisy_index():
+    index = JobIndex()
+    skills = ['python', 'aws', 'docker', 'django', 'sql', 'kubernetes']
+    for i in range(300):
+        index.add_job({
+            'id': i,
+            'title': 'Software Engineer',
+            'description': f"{skills[i % len(skills)]} services rare{i} team{i % 3}",
+        })
+    return index, skills
+
+
+def test_skill_terms_survive_query_pruning():
+    index, skills = build_noisy_index()
+    # 60 rare one-off tokens, the kind of noise names and employers produce
+    experience = ' '.join(f"rare{i}" for i in range(60))
+    query = index._query_weights(make_sections(skills=', '.join(skills), experience=experience))
+
+    assert len(query) <= MAX_QUERY_TERMS
+    assert set(skills) <= set(query)
+
+
+def test_other_section_is_down_weighted():
+    index, _ = build_noisy_index()
+    query = index._query_weights(make_sections(experience='rare7', other='rare8'))
+
+    assert 0 < query['rare8'] < query['rare7']
+
+
+def test_resume_without_headers_is_ranked():
+    index = JobIndex()
+    index.add_job({
+        'id': 'py',
+        'title': 'Python Developer',
+        'description': 'Build web apps',
+        'skills': ['Django', 'PostgreSQL', 'Kubernetes']
+    })
+    index.add_jobs([{'id': f"filler{i}", 'title': 'Office Manager'} for i in range(5)])
+
+    # extract_sections puts a resume with no recognised headers into 'other'
+    matches = index.search(make_sections(other='Python developer, 5 years building Django apps on PostgreSQL'))
+    assert [match['id'] for match in matches] == ['py']
+    assert matches[0]['matched_skills'] == ['django', 'postgresql']
+    assert matches[0]['missing_skills'] == ['Kubernetes']
+
+
+def test_matched_terms_follow_score_contributions():
+    index, _ = build_noisy_index()
+    sections = make_sections(skills='python', experience='rare6 team0')
+    query = index._query_weights(sections)
+    matches = index.search(sections, limit=5)
+    norms, _ = index._get_doc_arrays()
+
+    for match in matches:
+        doc = index._doc_ids[match['id']]
+        contributions = {}
+        for term, weight in query.items():
+            tf = index._postings[term].frequency(doc)
+            if tf:
+                contributions[term] = index._term_score(weight, tf, norms[doc])
+        assert round(sum(contributions.values()), 4) == match['score']
+        assert match['matched_terms'] == sorted(contributions, key=contributions.get, reverse=True)
+
+
+def test_extract_skills_from_cleaned_bullet_list():
+    # clean_text output for "• Python\n• SQL\n• Machine Learning\n| Docker"
+    assert extract_skills('Python  SQL  Machine Learning  Docker\n') == [
+        'python', 'sql', 'machine learning', 'docker'
+    ]
+    assert extract_skills('- Python - Node.js - Machine Learning') == ['python', 'node.js', 'machine learning']
+
+
+def test_bullet_list_skills_are_matched():
+    index = JobIndex()
+    index.add_job({'id': 'ml', 'title': 'Machine Learning Engineer', 'description': 'Python and SQL pipelines'})
+
+    # Whitespace-only list where even the bullets' double spaces were lost
+    for skills in ('Python  SQL  Machine Learning  Docker', 'Python SQL Machine Learning Docker'):
+        match = index.search(make_sections(skills=skills))[0]
+        assert sorted(match['matched_skills']) == ['machine learning', 'python', 'sql']
+
+
+def test_extract_skills_matches_clean_text_output():
+    cleaned = clean_text('• Python\n• SQL\n• Machine Learning\n| Docker')
+    assert extract_skills(cleaned) == ['python', 'sql', 'machine learning', 'docker']
+
+
+@pytest.mark.parametrize('skills, expected', [
+    ('Python\nSQL', ['python', 'sql']),
+    ('Python\nSQL\nDocker', ['python', 'sql', 'docker']),
+    ('Python\nSQL\nDocker\nMachine Learning', ['machine learning', 'python', 'sql', 'docker']),
+])
+def test_newline_separated_short_skill_lists_are_matched(skills, expected):
+    cleaned = clean_text(skills)
+    assert len(extract_skills(cleaned)) == 1  # newlines are gone, one fragment is left
+
+    index = JobIndex()
+    index.add_job({
+        'id': 'job',
+        'title': 'Machine Learning Engineer',
+        'description': 'Python services on Docker, reporting in SQL'
+    })
+    match = index.search(make_sections(skills=cleaned))[0]
+    assert match['matched_skills'] == expected
+
+
+def test_match_skill_prefers_whole_phrases_and_pairs():
+    text = ' machine learning engineer python and sql '
+    assert match_skill('machine learning', text) == ['machine learning']
+    assert match_skill('python machine learning', text) == ['machine learning', 'python']
+    assert match_skill('python and sql', text) == ['python and sql']
+    assert match_skill('rust', text) == []
+
+
+def test_jobs_added_by_one_worker_reach_the_others(tmp_path):
+    path = tmp_path / 'jobs.jsonl'
+    path.write_text('{"id": "a", "title": "Java Developer"}\n')
+    worker_a, worker_b = JobCorpus(str(path)), JobCorpus(str(path))
+
+    added = worker_a.add_jobs([{'title': 'Python Developer', 'skills': 'Python, Flask'}, {'title': ''}])
+
+    assert len(added) == 1
+    assert worker_b.search(make_sections(skills='Python'))[0]['id'] == added[0]
+    assert len(worker_b) == 2
+    # Persisted, so a freshly started worker loads it too
+    assert len(JobCorpus(str(path)).search(make_sections(skills='Python'))) == 1
+
+
+def test_corpus_replaces_jobs_by_id_across_workers(tmp_path):
+    path = tmp_path / 'jobs.jsonl'
+    worker_a, worker_b = JobCorpus(str(path)), JobCorpus(str(path))
+    worker_a.add_jobs([{'id': 'a', 'title': 'Java Developer'}])
+    worker_b.add_jobs([{'id': 'a', 'title': 'Python Developer'}])
+
+    for worker in (worker_a, worker_b):
+        assert len(worker.search(make_sections(skills='Java'))) == 0
+        assert worker.search(make_sections(skills='Python'))[0]['title'] == 'Python Developer'
+
+
+def test_corpus_reloads_rewritten_file(tmp_path):
+    path = tmp_path / 'jobs.jsonl'
+    path.write_text('{"id": "a", "title": "Java Developer"}\n{"id": "b", "title": "Go Developer"}\n')
+    corpus = JobCorpus(str(path))
+    corpus.refresh()
+    assert len(corpus) == 2
+
+    # While the replacement is being built, the old index keeps serving
+    with corpus._reload_lock:
+        path.write_text('{"id": "c", "title": "Python Developer"}\n')
+        assert corpus.search(make_sections(skills='Python')) == []
+        assert corpus.search(make_sections(skills='Java'))[0]['id'] == 'a'
+    corpus._reload_thread.join()
+
+    assert corpus.search(make_sections(skills='Python'))[0]['id'] == 'c'
+    assert len(corpus) == 1
+
+
+def test_corpus_waits_for_reload_when_asked(tmp_path):
+    path = tmp_path / 'jobs.jsonl'
+    path.write_text('{"id": "a", "title": "Java Developer"}\n')
+    corpus = JobCorpus(str(path))
+    corpus.refresh()
+    path.write_text('{"id": "b", "title": "Go Developer"}\n{"id": "c", "title": "Rust Developer"}\n')
+
+    corpus.refresh(wait=True)
+    assert len(corpus) == 2
+
+
+def test_corpus_keeps_valid_lines_of_a_damaged_file(tmp_path):
+    path = tmp_path / 'jobs.jsonl'
+    path.write_text('{"id": "a", "title": "Java Developer"}\n{"id": "b", "title\n{"id": "c", "title": "Go"}')
+    corpus = JobCorpus(str(path))
+    corpus.add_jobs([{'id': 'd', 'title': 'Python Developer'}])
+
+    assert len(corpus) == 3
+    assert len(JobCorpus(str(path)).search(make_sections(skills='Python'))) == 1
+
+
+def test_json_array_corpus_is_not_appended_to(tmp_path):
+    path = tmp_path / 'jobs.json'
+    path.write_text('[\n  {"id": "a", "title": "Java Developer"}\n]\n')
+    corpus = JobCorpus(str(path))
+
+    with pytest.raises(ValueError):
+        corpus.add_jobs([{'title': 'Python Developer'}])
+    assert len(corpus) == 1
+
+
+def assert_matches_fresh_index(index, jobs):
+    fresh = JobIndex()
+    fresh.add_jobs(jobs)
+    index._merge_all()
+
+    assert len(index) == len(fresh)
+    assert index._total_length == fresh._total_length
+    assert dict(index._doc_freqs) == dict(fresh._doc_freqs)
+    for term, postings in index._postings.items():
+        live_jobs = [index._jobs[doc]['id'] for doc in postings.docs if index._jobs[doc] is not None]
+        assert len(live_jobs) == index._doc_freqs[term]
+        fresh_postings = fresh._postings[term]
+        assert sorted(live_jobs) == sorted(fresh._jobs[doc]['id'] for doc in fresh_postings.docs)
+
+
+def test_replacing_jobs_keeps_index_consistent():
+    jobs = [
+        {'id': 'a', 'title': 'Python Developer', 'description': 'Django and SQL'},
+        {'id': 'b', 'title': 'Java Developer', 'description': 'Spring and SQL'},
+        {'id': 'c', 'title': 'Go Developer', 'description': 'Kubernetes'},
+    ]
+    index = JobIndex()
+    index.add_jobs(jobs)
+    index.search(make_sections(skills='SQL'))  # builds the cached per-doc arrays
+
+    jobs[0] = {'id': 'a', 'title': 'Rust Developer', 'description': 'Embedded systems'}
+    jobs[2] = {'id': 'c', 'title': 'Go Developer', 'description': 'Kubernetes and SQL'}
+    index.add_job(jobs[0])
+    index.add_job(jobs[2])
+
+    assert_matches_fresh_index(index, jobs)
+    assert 'django' not in index._postings
+    # Two of three jobs replaced, well past the compaction threshold
+    assert all(index._jobs[doc] is not None for p in index._postings.values() for doc in p.docs)
+    assert index.search(make_sections(skills='Django')) == []
+    assert [match['id'] for match in index.search(make_sections(skills='Rust'))] == ['a']
+
+
+def test_ranking_follows_skill_overlap():
+    index = JobIndex()
+    index.add_jobs([{'id': f"filler{i}", 'title': 'Office Manager'} for i in range(20)])
+    index.add_jobs([
+        {'id': 'one', 'title': 'Developer', 'description': 'Python'},
+        {'id': 'three', 'title': 'Developer', 'description': 'Python Docker Kubernetes'},
+        {'id': 'two', 'title': 'Developer', 'description': 'Python Docker'},
+    ])
+
+    matches = index.search(make_sections(skills='Python, Docker, Kubernetes'))
+    assert [match['id'] for match in matches] == ['three', 'two', 'one']
+    assert [match['score'] for match in matches] == sorted((m['score'] for m in matches), reverse=True)
+    assert index.search(make_sections(skills='Python'), limit=1)[0]['id'] == 'one'
+
+
+def test_search_matches_brute_force_bm25():
+    rng = random.Random(3)
+    words = [f"term{i}" for i in range(40)]
+    jobs = [
+        {'id': i, 'title': 'Engineer', 'description': ' '.join(rng.choices(words, k=rng.randint(5, 30)))}
+        for i in range(200)
+    ]
+    index = JobIndex()
+    index.add_jobs(jobs)
+    sections = make_sections(skills=', '.join(words[:5]), experience=' '.join(rng.choices(words, k=60)))
+
+    query = index._query_weights(sections)
+    avg_length = index._total_length / len(index)
+    expected = {}
+    for job in jobs:
+        terms = tokenize(f"{job['title']}\n{job['description']}")
+        norm = BM25_K1 * (1 - BM25_B + BM25_B * len(terms) / avg_length)
+        score = sum(index._term_score(weight, terms.count(term), norm) for term, weight in query.items())
+        if score:
+            expected[str(job['id'])] = score
+
+    matches = index.search(sections, limit=10)
+    top = sorted(expected.items(), key=lambda item: -item[1])[:10]
+    assert [match['score'] for match in matches] == pytest.approx([score for _, score in top], abs=1e-3)
+
+
+def test_explanations_report_matched_and_missing_skills():
+    index = JobIndex()
+    index.add_jobs([{'id': f"filler{i}", 'title': 'Office Manager'} for i in range(10)])
+    index.add_job({
+        'id': 'ds',
+        'title': 'Data Scientist',
+        'description': 'Machine learning with Python, SQL dashboards',
+        'skills': ['Python', 'Machine Learning', 'Tableau'],
+        'company': 'Acme',
+        'link': 'https://example.com/jobs/ds'
+    })
+
+    match = index.search(make_sections(skills='Python, Machine Learning, Excel', experience='Built SQL reports'))[0]
+    assert match['id'] == 'ds'
+    assert match['company'] == 'Acme'
+    assert match['link'] == 'https://example.com/jobs/ds'
+    assert match['matched_skills'] == ['python', 'machine learning']
+    assert match['missing_skills'] == ['Tableau']
+    assert set(match['matched_terms']) == {'python', 'machine', 'learning', 'sql'}
+
+
+def test_jobs_added_after_a_search_are_ranked():
+    index = JobIndex()
+    index.add_jobs([{'id': i, 'title': 'Office Manager', 'description': f"office{i}"} for i in range(30)])
+    assert index.search(make_sections(skills='Python')) == []
+
+    index.add_job({'id': 'py', 'title': 'Python Developer'})
+    index.add_job({'id': 0, 'title': 'Python Engineer'})
+
+    matches = index.search(make_sections(skills='Python'))
+    assert sorted(match['id'] for match in matches) == ['0', 'py']
+    assert index.search(make_sections(skills='office0')) == []
+
+
+def test_skills_are_ranked_in_a_small_corpus():
+    index = JobIndex()
+    index.add_jobs([{'id': 'a', 'title': 'Python Developer'}, {'id': 'b', 'title': 'Python Engineer'}])
+
+    assert sorted(match['id'] for match in index.search(make_sections(skills='Python'))) == ['a', 'b']
+
+
+def test_common_skill_still_ranks_in_a_skill_heavy_corpus():
+    index = JobIndex()
+    index.add_jobs([{'id': f"py{i}", 'title': 'Python Developer'} for i in range(5)])
+    index.add_job({'id': 'java', 'title': 'Java Developer'})
+
+    matches = index.search(make_sections(skills='Python, Java'))
+    assert sorted(match['id'] for match in matches) == ['java', 'py0', 'py1', 'py2', 'py3', 'py4']
+
+    # Same shape past the pruning threshold: the skill survives, a generic word does not
+    index = JobIndex()
+    index.add_jobs([{'id': i, 'title': 'Python Developer', 'description': f"team job{i}"} for i in range(1200)])
+    index.add_jobs([{'id': f"java{i}", 'title': 'Java Developer', 'description': f"job{i}"} for i in range(300)])
+    query = index._query_weights(make_sections(skills='Python', experience='team team'))
+    assert 'python' in query
+    assert 'team' not in query
@@ -0,0 +1,662 @@
+import fcntl
+import json
+import logging
+import math
+import os
+import re
+import threading
+import time
+import uuid
+from collections import Counter
+from heapq import nlargest
+
+import numpy as np
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Local corpus of job descriptions. Jobs added at runtime are appended to it.
+# Each worker indexes it at startup, which takes roughly 30-50 seconds per
+# 100k jobs, so keep gunicorn's --timeout above that for large corpora
+JOB_DESCRIPTIONS_PATH = os.getenv('JOB_DESCRIPTIONS_PATH', 'data/job_descriptions.jsonl')
+
+# BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Length norms are cached against the average job length and only rebuilt
+# once the average drifts this far, so adding a job stays cheap
+NORM_REBUILD_DRIFT = 0.05
+
+# Bytes remembered before the read offset of the corpus file. If they change,
+# the file was rewritten in place rather than appended to
+TAIL_CHECK_BYTES = 256
+
+# Buffered postings are merged into the arrays once this many pile up
+MAX_PENDING_POSTINGS = 2000000
+
+# Postings of replaced jobs are masked while scoring and only compacted away
+# once they make up this share of the index
+MAX_DEAD_POSTINGS_RATIO = 0.1
+
+# Query pruning keeps scoring time bounded on large corpora: skills get
+# reserved slots and the rest go to the terms the resume repeats most.
+# Non-skill terms found in most jobs are skipped, but only once the corpus is
+# big enough for that to mean the word is generic rather than the domain
+MAX_QUERY_TERMS = 48
+MAX_SKILL_TERMS = 32
+MAX_DF_RATIO = 0.4
+MIN_JOBS_FOR_DF_PRUNING = 1000
+
+# How much each resume section contributes to the query. The 'other' section
+# is mostly contact details and a summary, so it counts for little unless the
+# resume has no recognised headers and it holds everything
+SECTION_WEIGHTS = {
+    'skills': 3.0,
+    'experience': 1.0,
+    'education': 0.5,
+    'other': 0.25
+}
+UNSECTIONED_WEIGHT = 1.0
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9][a-z0-9.\-]*[a-z0-9]|[a-z0-9]')
+# clean_text collapses newlines and strips bullet and pipe characters, which
+# leaves a double space where a bullet was. Dashes used as bullets survive
+SKILL_SEPARATORS = re.compile(r'[,;:\(\)]|\s{2,}|(?:^|\s)-\s')
+
+STOPWORDS = frozenset("""
+a about above after all also an and any are as at be been being below between both but by
+can could did do does doing during each etc for from further had has have having he her his
+how i if in into is it its itself just me more most my no nor not of off on once only or other
+our out over own per same she should so some such than that the their them then there these
+they this those through to too under until up us very was we were what when where which while
+who whom why will with within would you your
+""".split())
+
+
+def _words(text):
+    """Split text into lowercase words, keeping stopwords"""
+    if not text:
+        return []
+    return TOKEN_PATTERN.findall(str(text).lower())
+
+
+def tokenize(text):
+    """Split text into lowercase terms, dropping stopwords"""
+    return [t for t in _words(text) if t not in STOPWORDS]
+
+
+def _phrase(text):
+    """Normalized phrase used to look a skill up in a word sequence"""
+    words = _words(text)
+    while words and words[0] in STOPWORDS:
+        words.pop(0)
+    while words and words[-1] in STOPWORDS:
+        words.pop()
+    return ' '.join(words)
+
+
+def extract_skills(skills_text):
+    """Split a cleaned resume skills section into normalized skill phrases"""
+    skills = []
+    for part in SKILL_SEPARATORS.split(skills_text or ''):
+        phrase = _phrase(part)
+        if phrase and phrase not in skills:
+            skills.append(phrase)
+    return skills
+
+
+def match_skill(phrase, text):
+    """
+    Find a resume skill phrase in a space-padded word sequence.
+    clean_text turns a newline separated list into one line, so a phrase
+    that does not match whole may be several skills run together: its word
+    pairs are tried next, then the words no matched pair covers.
+    """
+    if f" {phrase} " in text:
+        return [phrase]
+    words = phrase.split()
+    if len(words) < 2:
+        return []
+    matched = [
+        f"{a} {b}" for a, b in zip(words, words[1:])
+        if a not in STOPWORDS and b not in STOPWORDS and f" {a} {b} " in text
+    ]
+    covered = {word for pair in matched for word in pair.split()}
+    matched += [
+        word for word in words
+        if word not in STOPWORDS and word not in covered and f" {word} " in text
+    ]
+    return matched
+
+
+def normalize_job_skills(skills):
+    """Turn a job's skills field (list or comma separated string) into a list of strings"""
+    if isinstance(skills, str):
+        skills = re.split(r'[,;]', skills)
+    elif not isinstance(skills, (list, tuple)):
+        return []
+    return [str(skill).strip() for skill in skills if skill is not None and str(skill).strip()]
+
+
+def prepare_job(job):
+    """Validate a job description and normalize its id and skills"""
+    if not isinstance(job, dict):
+        raise ValueError("Job description must be an object")
+    if not job.get('title') and not job.get('description'):
+        raise ValueError("Job description needs a title or description")
+
+    job = dict(job)
+    job['skills'] = normalize_job_skills(job.get('skills'))
+    # Generated ids are random so they can never collide with a real one
+    job['id'] = uuid.uuid4().hex if job.get('id') is None else str(job['id'])
+    return job
+
+
+def _job_text(job):
+    """Text of a job description that gets indexed"""
+    parts = [job.get('title', ''), job.get('description', ''), ' '.join(job.get('skills', []))]
+    return '\n'.join(str(part) for part in parts if part)
+
+
+class _Postings:
+    """Doc numbers (ascending) and term frequencies of one term"""
+
+    __slots__ = ('docs', 'tfs', 'pending_docs', 'pending_tfs')
+
+    def __init__(self):
+        self.docs = np.empty(0, dtype=np.int32)
+        self.tfs = np.empty(0, dtype=np.float32)
+        # Entries added since the last merge, kept as lists so adds stay O(1)
+        self.pending_docs = []
+        self.pending_tfs = []
+
+    def merge(self, dead, compact=False):
+        """Fold pending entries into the arrays and drop removed jobs"""
+        if not self.pending_docs and not compact:
+            return
+        docs = np.concatenate((self.docs, np.array(self.pending_docs, dtype=np.int32)))
+        tfs = np.concatenate((self.tfs, np.array(self.pending_tfs, dtype=np.float32)))
+        live = ~dead[docs]
+        self.docs, self.tfs = docs[live], tfs[live]
+        self.pending_docs = []
+        self.pending_tfs = []
+
+    def frequency(self, doc):
+        i = np.searchsorted(self.docs, doc)
+        if i < len(self.docs) and self.docs[i] == doc:
+            return float(self.tfs[i])
+        return 0.0
+
+
+class JobIndex:
+    """
+    Inverted index over job descriptions scored with BM25.
+    Posting lists are numpy arrays so a query is scored with a few vectorized
+    operations per term. Jobs can be added or replaced incrementally: new
+    entries are buffered per term and merged the next time the term is used.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._postings = {}  # term -> _Postings
+        self._doc_freqs = Counter()  # term -> number of live jobs containing it
+        self._pending = 0  # buffered postings across all terms
+        self._dead_postings = 0  # postings of removed jobs not compacted yet
+        self._jobs = []  # doc -> job dict, None once removed
+        self._doc_lengths = []
+        self._doc_ids = {}  # job id -> doc
+        self._total_length = 0
+        # Per-doc arrays used while scoring, built lazily
+        self._length_norms = None
+        self._norm_avg_length = 0.0
+        self._dead = None
+
+    def __len__(self):
+        return len(self._doc_ids)
+
+    def add_job(self, job):
+        """Index a single job description, replacing any job with the same id"""
+        job = prepare_job(job)
+        job_id = job['id']
+        terms = tokenize(_job_text(job))
+
+        with self._lock:
+            if job_id in self._doc_ids:
+                self._remove_doc(self._doc_ids[job_id])
+
+            doc = len(self._jobs)
+            self._jobs.append(job)
+            self._doc_lengths.append(len(terms))
+            self._doc_ids[job_id] = doc
+            self._total_length += len(terms)
+
+            counts = Counter(terms)
+            all_postings = self._postings
+            for term, tf in counts.items():
+                postings = all_postings.get(term)
+                if postings is None:
+                    postings = all_postings[term] = _Postings()
+                postings.pending_docs.append(doc)
+                postings.pending_tfs.append(tf)
+            self._doc_freqs.update(counts.keys())
+            self._pending += len(counts)
+
+            if self._length_norms is not None:
+                norm = self._length_norm(len(terms), self._norm_avg_length)
+                self._length_norms = np.append(self._length_norms, norm)
+                self._dead = np.append(self._dead, False)
+
+            # Bound the memory held in Python lists during bulk loads
+            if self._pending > MAX_PENDING_POSTINGS:
+                self._merge_all()
+        return job_id
+
+    def add_jobs(self, jobs):
+        """Index several job descriptions, skipping invalid entries"""
+        added = []
+        for job in jobs:
+            try:
+                added.append(self.add_job(job))
+            except ValueError as e:
+                logger.warning(f"Skipping job description: {str(e)}")
+        # Merge once per batch so the first search after a load is not slowed down
+        with self._lock:
+            self._merge_all()
+        logger.info(f"Indexed {len(added)} job descriptions ({len(self)} total)")
+        return added
+
+    def _remove_doc(self, doc):
+        job = self._jobs[doc]
+        # Removed jobs stay in the posting arrays, masked out while scoring,
+        # until their terms are merged again or the index is compacted
+        terms = set(tokenize(_job_text(job)))
+        self._dead_postings += len(terms)
+        for term in terms:
+            self._doc_freqs[term] -= 1
+            if not self._doc_freqs[term]:
+                del self._doc_freqs[term]
+                self._pending -= len(self._postings.pop(term).pending_docs)
+        del self._doc_ids[job['id']]
+        self._total_length -= self._doc_lengths[doc]
+        self._doc_lengths[doc] = 0
+        self._jobs[doc] = None
+        if self._dead is not None:
+            self._dead[doc] = True
+
+    def _merge_all(self):
+        _, dead = self._get_doc_arrays()
+        compact = self._dead_postings > MAX_DEAD_POSTINGS_RATIO * sum(self._doc_freqs.values())
+        for postings in self._postings.values():
+            postings.merge(dead, compact)
+        self._pending = 0
+        if compact:
+            self._dead_postings = 0
+
+    @staticmethod
+    def _length_norm(length, avg_length):
+        return BM25_K1 * (1 - BM25_B + BM25_B * length / avg_length)
+
+    def _get_doc_arrays(self):
+        """Length norms and removed-job mask, indexed by doc"""
+        avg_length = self._total_length / max(len(self), 1) or 1.0
+        drift = abs(avg_length - self._norm_avg_length)
+        if self._length_norms is None or drift > NORM_REBUILD_DRIFT * self._norm_avg_length:
+            lengths = np.array(self._doc_lengths, dtype=np.float64)
+            self._length_norms = self._length_norm(lengths, avg_length)
+            self._norm_avg_length = avg_length
+        if self._dead is None:
+            self._dead = np.array([job is None for job in self._jobs], dtype=bool)
+        return self._length_norms, self._dead
+
+    def _idf(self, df):
+        n = len(self)
+        return math.log(1 + (n - df + 0.5) / (df + 0.5))
+
+    def _query_weights(self, sections):
+        unsectioned = not any(
+            (text or '').strip() for section, text in sections.items() if section != 'other'
+        )
+        weights = {}
+        for section, text in sections.items():
+            section_weight = SECTION_WEIGHTS.get(section, 0.0)
+            if section == 'other' and unsectioned:
+                section_weight = UNSECTIONED_WEIGHT
+            for term in tokenize(text):
+                weights[term] = weights.get(term, 0.0) + section_weight
+
+        skill_terms = set(tokenize(sections.get('skills', '')))
+        prune_common = len(self) >= MIN_JOBS_FOR_DF_PRUNING
+        max_df = MAX_DF_RATIO * len(self)
+        doc_freqs = {}
+        for term in weights:
+            df = self._doc_freqs.get(term, 0)
+            if not df:
+                continue
+            # Skills are never dropped, a Python-heavy corpus still ranks Python
+            if prune_common and df > max_df and term not in skill_terms:
+                continue
+            doc_freqs[term] = df
+
+        # Rank by how often the resume uses a term, not by idf, so rare one-off
+        # tokens (employers, project names) cannot push the skills out
+        def priority(term):
+            return weights[term], doc_freqs[term]
+
+        selected = nlargest(MAX_SKILL_TERMS, [t for t in doc_freqs if t in skill_terms], key=priority)
+        selected += nlargest(
+            MAX_QUERY_TERMS - len(selected),
+            [t for t in doc_freqs if t not in skill_terms],
+            key=priority
+        )
+
+        query = {}
+        for term in selected:
+            # Dampen repeated terms so one word cannot dominate the resume
+            weight = weights[term]
+            term_weight = 1 + math.log(weight) if weight > 1 else weight
+            query[term] = term_weight * self._idf(doc_freqs[term])
+        return query
+
+    @staticmethod
+    def _term_score(weight, tf, norm):
+        return weight * tf * (BM25_K1 + 1) / (tf + norm)
+
+    def search(self, sections, limit=10):
+        """
+        Rank indexed jobs against resume sections (as returned by extract_sections)
+        Returns the top matches with skill-overlap explanations
+        """
+        with self._lock:
+            if not len(self):
+                return []
+
+            query = self._query_weights(sections)
+            norms, dead = self._get_doc_arrays()
+            k1_plus_one = BM25_K1 + 1
+
+            # Vectorized _term_score, each doc appears once per posting list
+            scores = np.zeros(len(self._jobs))
+            for term, weight in query.items():
+                postings = self._postings[term]
+                if postings.pending_docs:
+                    self._pending -= len(postings.pending_docs)
+                    postings.merge(dead)
+                docs, tfs = postings.docs, postings.tfs
+                scores[docs] += weight * tfs * k1_plus_one / (tfs + norms[docs])
+            scores[dead] = 0.0
+
+            candidates = np.flatnonzero(scores)
+            if len(candidates) > limit:
+                candidates = candidates[np.argpartition(scores[candidates], -limit)[-limit:]]
+            top_docs = sorted(((int(doc), float(scores[doc])) for doc in candidates), key=lambda item: -item[1])
+            resume_skills = extract_skills(sections.get('skills', ''))
+            resume_text = ' ' + ' '.join(_words(' '.join(sections.values()))) + ' '
+
+            return [
+                self._explain(doc, score, query, norms, resume_skills, resume_text)
+                for doc, score in top_docs
+            ]
+
+    def _explain(self, doc, score, query, norms, resume_skills, resume_text):
+        job = self._jobs[doc]
+        job_text = ' ' + ' '.join(_words(_job_text(job))) + ' '
+
+        matched_skills = []
+        for skill in resume_skills:
+            for match in match_skill(skill, job_text):
+                if match not in matched_skills:
+                    matched_skills.append(match)
+        # Drop single words already covered by a longer matched phrase
+        matched_skills = [
+            skill for skill in matched_skills
+            if not any(skill != other and f" {skill} " in f" {other} " for other in matched_skills)
+        ]
+
+        # The job's own skills found anywhere in the resume also count, which
+        # covers resumes without a recognised skills section
+        missing_skills = []
+        for skill in job['skills']:
+            phrase = _phrase(skill)
+            if not phrase:
+                continue
+            if f" {phrase} " in resume_text:
+                if phrase not in matched_skills:
+                    matched_skills.append(phrase)
+            else:
+                missing_skills.append(str(skill))
+
+        # Same per-term BM25 contribution as the ranking score
+        contributions = {}
+        for term, weight in query.items():
+            tf = self._postings[term].frequency(doc)
+            if tf:
+                contributions[term] = self._term_score(weight, tf, norms[doc])
+        top_terms = [term for term, _ in nlargest(10, contributions.items(), key=lambda item: item[1])]
+
+        return {
+            "id": job['id'],
+            "title": job.get('title', ''),
+            "company": job.get('company', ''),
+            "location": job.get('location', ''),
+            "link": job.get('link', ''),
+            "score": round(score, 4),
+            "matched_skills": matched_skills,
+            "missing_skills": missing_skills,
+            "matched_terms": top_terms
+        }
+
+
+def parse_jobs(content):
+    """
+    Parse job descriptions from a JSON document (array or single object) or JSON Lines
+    Malformed lines are logged and skipped so one bad entry cannot drop the corpus
+    """
+    content = content.strip()
+    if not content:
+        return []
+
+    try:
+        data = json.loads(content)
+        if isinstance(data, list):
+            return data
+        if isinstance(data, dict):
+            return [data]
+    except ValueError:
+        pass
+
+    jobs = []
+    for line_number, line in enumerate(content.splitlines(), 1):
+        if not line.strip():
+            continue
+        try:
+            jobs.append(json.loads(line))
+        except ValueError as e:
+            logger.warning(f"Skipping malformed job description on line {line_number}: {str(e)}")
+    return jobs
+
+
+def load_jobs(path):
+    """Load job descriptions from a JSON or JSON Lines file"""
+    with open(path, encoding='utf-8') as f:
+        return parse_jobs(f.read())
+
+
+class JobCorpus:
+    """
+    Job index kept in sync with the corpus file.
+    New jobs are appended to the file as JSON Lines and every process reads
+    lines it has not seen before searching, so all workers serve the same
+    jobs and additions survive a restart. When the file is replaced, the new
+    index is built in the background while the current one keeps serving.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.index = JobIndex()
+        self._lock = threading.Lock()  # guards the fields below and appends to the live index
+        self._reload_lock = threading.Lock()  # one full reload at a time
+        self._reload_thread = None
+        self._file_id = None
+        self._offset = 0
+        self._tail = b''  # last bytes before the offset, to tell appends from rewrites
+        self._appendable = True
+
+    def __len__(self):
+        return len(self.index)
+
+    def _read(self, offset, tail=b''):
+        """
+        Read the file from offset, returning (bytes, end offset, file id)
+        The bytes are None if the file no longer has tail just before offset
+        """
+        with open(self.path, 'rb') as f:
+            # Shared lock so a concurrent append is never read half written
+            fcntl.flock(f, fcntl.LOCK_SH)
+            try:
+                stat = os.fstat(f.fileno())
+                f.seek(offset - len(tail))
+                data = f.read()
+                end = f.tell()
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+        if not data.startswith(tail):
+            return None, end, (stat.st_dev, stat.st_ino)
+        return data[len(tail):], end, (stat.st_dev, stat.st_ino)
+
+    def _advance(self, data, end):
+        self._offset = end
+        self._tail = (self._tail + data)[-TAIL_CHECK_BYTES:]
+
+    def _needs_reload(self):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return False
+        return (
+            (stat.st_dev, stat.st_ino) != self._file_id
+            or stat.st_size < self._offset
+            or (stat.st_size != self._offset and not self._appendable)
+        )
+
+    def refresh(self, wait=False):
+        """
+        Index anything written to the corpus file since the last refresh
+        A new or rewritten file is reloaded in a background thread unless
+        wait is set or nothing has been loaded yet
+        """
+        with self._lock:
+            if not os.path.exists(self.path):
+                return
+            if not self._needs_reload():
+                if os.path.getsize(self.path) <= self._offset:
+                    return
+                data, end, _ = self._read(self._offset, self._tail)
+                if data is not None:
+                    self._advance(data, end)
+                    self.index.add_jobs(parse_jobs(data.decode('utf-8', errors='replace')))
+                    return
+                # Same file, but rewritten in place rather than appended to
+                self._file_id = None
+            if not wait and len(self.index):
+                if self._reload_thread is None or not self._reload_thread.is_alive():
+                    logger.info(f"Job descriptions file changed, reloading in the background: {self.path}")
+                    self._reload_thread = threading.Thread(target=self._reload, daemon=True)
+                    self._reload_thread.start()
+                return
+        self._reload()
+
+    def _reload(self):
+        with self._reload_lock:
+            with self._lock:
+                if not self._needs_reload():
+                    return
+            # Built without holding the lock, searches keep using the old index
+            start_time = time.time()
+            data, end, file_id = self._read(0)
+            content = data.decode('utf-8', errors='replace')
+            index = JobIndex()
+            index.add_jobs(parse_jobs(content))
+            with self._lock:
+                self.index = index
+                self._file_id = file_id
+                self._tail = b''
+                self._advance(data, end)
+                self._appendable = _is_json_lines(content)
+            logger.info(f"Loaded {len(index)} job descriptions from {self.path} in {time.time() - start_time:.1f} seconds")
+
+    def add_jobs(self, jobs):
+        """Append job descriptions to the corpus file and index them"""
+        self.refresh(wait=True)
+        if not self._appendable:
+            raise ValueError("Job descriptions file is not JSON Lines, new jobs cannot be appended to it")
+
+        prepared = []
+        for job in jobs:
+            try:
+                prepared.append(prepare_job(job))
+            except ValueError as e:
+                logger.warning(f"Skipping job description: {str(e)}")
+        if not prepared:
+            return []
+
+        lines = ''.join(json.dumps(job) + '\n' for job in prepared).encode('utf-8')
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, 'ab+') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.seek(0, os.SEEK_END)
+                if f.tell():
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b'\n':
+                        lines = b'\n' + lines
+                f.write(lines)
+                f.flush()
+                os.fsync(f.fileno())
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+        self.refresh(wait=True)
+        return [job['id'] for job in prepared]
+
+    def search(self, sections, limit=10):
+        """Rank the current corpus against resume sections"""
+        self.refresh()
+        return self.index.search(sections, limit=limit)
+
+
+def _is_json_lines(content):
+    # A pretty-printed JSON document breaks if lines are appended to it
+    content = content.strip()
+    if not content or '\n' not in content:
+        return True
+    try:
+        json.loads(content)
+    except ValueError:
+        return True
+    return False
+
+
+_job_corpus = None
+_job_corpus_lock = threading.Lock()
+
+
+def get_job_corpus():
+    """Return the shared job corpus, loading the local file on first use"""
+    global _job_corpus
+    if _job_corpus is None:
+        with _job_corpus_lock:
+            if _job_corpus is None:
+                corpus = JobCorpus(JOB_DESCRIPTIONS_PATH)
+                if os.path.exists(JOB_DESCRIPTIONS_PATH):
+                    try:
+                        corpus.refresh(wait=True)
+                    except Exception as e:
+                        logger.error(f"Error loading job descriptions: {str(e)}")
+                else:
+                    logger.warning(f"Job descriptions file not found: {JOB_DESCRIPTIONS_PATH}")
+                _job_corpus = corpus
+    return _job_corpus
@@ -103,9 +103,9 @@ def parse_docx(file_stream):
         logger.error(f"Error parsing DOCX: {str(e)}")
         raise
 
-def parse_resume(file):
+def parse_resume_sections(file):
     """
-    Parse resume file (PDF or DOCX) and extract text content
+    Parse resume file (PDF or DOCX) and return its organized sections
     """
     try:
         filename = file.filename.lower()
@@ -123,10 +123,15 @@ def parse_resume(file):
             raise ValueError("Unsupported file format. Please upload a PDF or DOCX file.")
             
         # Extract and organize sections
-        sections = extract_sections(text)
+        return extract_sections(text)
         
-        # Combine sections in a structured way
-        structured_text = f"""
+    except Exception as e:
+        logger.error(f"Error parsing resume: {str(e)}")
+        raise
+
+def format_sections(sections):
+    """Combine resume sections into the structured text used for analysis"""
+    structured_text = f"""
 EXPERIENCE:
 {sections['experience']}
 
@@ -139,8 +144,10 @@ SKILLS:
 ADDITIONAL INFORMATION:
 {sections['other']}
 """
-        return structured_text.strip()
-        
-    except Exception as e:
-        logger.error(f"Error parsing resume: {str(e)}")
-        raise
+    return structured_text.strip()
+
+def parse_resume(file):
+    """
+    Parse resume file (PDF or DOCX) and extract text content
+    """
+    return format_sections(parse_resume_sections(file))